@@ -3,7 +3,9 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from app.middleware import UploadSizeLimitMiddleware
 from app.routers import reports, activity, generate, schedules
 from app.services import scheduler as sched_service
 
@@ -31,6 +33,9 @@ origins = [
     *_extra,
 ]
 
+# Reject oversized uploads before the multipart parser buffers them
+app.add_middleware(UploadSizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -39,6 +44,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (template previews, activity entries)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(reports.router)
 app.include_router(activity.router)
 app.include_router(generate.router)
@@ -0,0 +1,56 @@
+"""
+ASGI middleware applied in main.py ahead of the routers.
+"""
+import os
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+UPLOAD_PATH = "/reports/upload"
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+# Headroom for the multipart boundary and part headers around the file itself;
+# the exact per-file limit is enforced by the reports router while streaming.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+MAX_UPLOAD_REQUEST_BYTES = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+
+UPLOAD_TOO_LARGE = f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit."
+UPLOAD_REQUEST_TOO_LARGE = (
+    f"Upload request exceeds {MAX_UPLOAD_REQUEST_BYTES} bytes "
+    f"(the {MAX_UPLOAD_BYTES} byte file limit plus multipart overhead)."
+)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Caps the raw request body of /reports/upload at MAX_UPLOAD_REQUEST_BYTES
+    before multipart parsing spools it to disk: rejects on Content-Length up
+    front and aborts as soon as a body without one streams past the cap.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != UPLOAD_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > MAX_UPLOAD_REQUEST_BYTES:
+            response = JSONResponse(status_code=413, content={"detail": UPLOAD_REQUEST_TOO_LARGE})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_UPLOAD_REQUEST_BYTES:
+                    raise HTTPException(status_code=413, detail=UPLOAD_REQUEST_TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
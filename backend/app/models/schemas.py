@@ -8,6 +8,8 @@ class UploadedReport(BaseModel):
     file_type: str
     content_preview: str
     uploaded_at: datetime
+    size_bytes: int
+    sha256: str
 
 
 class ActivityEntry(BaseModel):
@@ -26,7 +28,7 @@ class ActivitySummary(BaseModel):
 
 class ReportGenerationRequest(BaseModel):
     report_type: str  # "daily", "weekly", "social_media"
-    date_range: Optional[str] = None
+    date_range: Optional[str] = None  # "YYYY-MM-DD/YYYY-MM-DD"; weekly defaults to the last 7 days
     additional_notes: Optional[str] = None
     tone: str = "professional"  # "professional", "casual", "concise"
 
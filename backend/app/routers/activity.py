@@ -1,5 +1,5 @@
-from fastapi import APIRouter
-from app.services import activity_monitor
+from fastapi import APIRouter, Request, Response
+from app.services import activity_monitor, versioning
 
 router = APIRouter(prefix="/activity", tags=["activity"])
 
@@ -16,7 +16,9 @@ async def stop_monitoring():
 
 
 @router.get("/status")
-async def monitoring_status():
+async def monitoring_status(request: Request, response: Response):
+    if (cached := versioning.not_modified(request, response, versioning.activity)) is not None:
+        return cached
     return {
         "is_running": activity_monitor.is_monitoring(),
         "summary": activity_monitor.get_session_summary()
@@ -24,5 +26,7 @@ async def monitoring_status():
 
 
 @router.get("/summary")
-async def get_summary():
+async def get_summary(request: Request, response: Response):
+    if (cached := versioning.not_modified(request, response, versioning.activity)) is not None:
+        return cached
     return activity_monitor.get_session_summary()
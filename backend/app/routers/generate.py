@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
 
 from app.models.schemas import ReportGenerationRequest, GeneratedReport
-from app.services import ai_generator, activity_monitor
+from app.services import ai_generator, activity_monitor, report_history
 from app.services.email_service import send_report_email
 
 router = APIRouter(prefix="/generate", tags=["generate"])
@@ -10,14 +11,24 @@ router = APIRouter(prefix="/generate", tags=["generate"])
 
 @router.post("/report", response_model=GeneratedReport)
 async def generate_report(request: ReportGenerationRequest):
+    if request.date_range:
+        try:
+            report_history.parse_date_range(
+                request.date_range, single_day=request.report_type == "daily"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
     activity_summary = activity_monitor.get_session_summary()
 
     try:
-        content = ai_generator.generate_report(
+        content = await run_in_threadpool(
+            ai_generator.generate_report,
             report_type=request.report_type,
             activity_summary=activity_summary,
             additional_notes=request.additional_notes or "",
-            tone=request.tone
+            tone=request.tone,
+            date_range=request.date_range
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI generation failed: {str(e)}")
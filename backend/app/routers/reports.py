@@ -1,10 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pathlib import Path
 from datetime import datetime
-import shutil
+import hashlib
+import uuid
 
+import aiofiles
+import aiofiles.os
+
+from app.middleware import MAX_UPLOAD_BYTES, UPLOAD_TOO_LARGE
+from app.services import versioning
 from app.services.report_parser import parse_file
+from app.services.style_profile import build_style_profile, profile_path, save_style_profile
 from app.models.schemas import UploadedReport
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -16,6 +23,35 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 PARSED_DIR.mkdir(parents=True, exist_ok=True)
 
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".xlsx", ".xls", ".txt", ".md"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Last /templates payload, keyed by the template-set ETag it was built for
+_templates_cache: dict = {"etag": None, "body": None}
+
+
+async def _stream_to_disk(file: UploadFile, dest: Path) -> tuple[str, int]:
+    """
+    Stream an upload into a temp file next to `dest` in async chunks, enforcing
+    MAX_UPLOAD_BYTES and hashing as bytes arrive. The file is only renamed into
+    place once fully written. Returns (sha256_hex, size_bytes).
+    """
+    tmp_path = dest.with_name(f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=UPLOAD_TOO_LARGE)
+                digest.update(chunk)
+                await out.write(chunk)
+        await aiofiles.os.replace(tmp_path, dest)
+    except BaseException:
+        if await aiofiles.os.path.exists(tmp_path):
+            await aiofiles.os.remove(tmp_path)
+        raise
+    return digest.hexdigest(), size
 
 
 @router.post("/upload", response_model=UploadedReport)
@@ -27,29 +63,42 @@ async def upload_report(file: UploadFile = File(...)):
             detail=f"File type '{suffix}' not supported. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
 
-    save_path = UPLOAD_DIR / file.filename
-    with open(save_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    filename = Path(file.filename).name
+    save_path = UPLOAD_DIR / filename
+    content_hash, size_bytes = await _stream_to_disk(file, save_path)
 
     try:
-        content, file_type = parse_file(str(save_path))
+        content, file_type = await run_in_threadpool(parse_file, str(save_path))
     except Exception as e:
         save_path.unlink(missing_ok=True)
         raise HTTPException(status_code=422, detail=f"Could not parse file: {str(e)}")
 
-    parsed_path = PARSED_DIR / f"{Path(file.filename).stem}.txt"
-    parsed_path.write_text(content, encoding="utf-8")
+    parsed_path = PARSED_DIR / f"{Path(filename).stem}.txt"
+    async with aiofiles.open(parsed_path, "w", encoding="utf-8") as f:
+        await f.write(content)
+
+    profile = await run_in_threadpool(build_style_profile, content)
+    await run_in_threadpool(save_style_profile, parsed_path, profile)
+    versioning.templates.bump()
 
     return UploadedReport(
-        filename=file.filename,
+        filename=filename,
         file_type=file_type,
         content_preview=content[:500] + ("..." if len(content) > 500 else ""),
-        uploaded_at=datetime.now()
+        uploaded_at=datetime.now(),
+        size_bytes=size_bytes,
+        sha256=content_hash,
     )
 
 
 @router.get("/templates")
-async def list_templates():
+async def list_templates(request: Request, response: Response):
+    if (cached := versioning.not_modified(request, response, versioning.templates)) is not None:
+        return cached
+    etag = response.headers["ETag"]
+    if _templates_cache["etag"] == etag:
+        return _templates_cache["body"]
+
     templates = []
     for f in PARSED_DIR.glob("*.txt"):
         preview = f.read_text(encoding="utf-8")[:300]
@@ -58,7 +107,9 @@ async def list_templates():
             "preview": preview,
             "size_chars": f.stat().st_size
         })
-    return {"templates": templates, "count": len(templates)}
+    body = {"templates": templates, "count": len(templates)}
+    _templates_cache.update(etag=etag, body=body)
+    return body
 
 
 @router.delete("/templates/{name}")
@@ -67,4 +118,6 @@ async def delete_template(name: str):
     if not parsed_path.exists():
         raise HTTPException(status_code=404, detail="Template not found")
     parsed_path.unlink()
+    profile_path(parsed_path).unlink(missing_ok=True)
+    versioning.templates.bump()
     return {"status": "deleted", "name": name}
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
-from app.services import scheduler as sched_service
+from app.services import scheduler as sched_service, versioning
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
@@ -15,7 +15,9 @@ class ScheduleCreate(BaseModel):
 
 
 @router.get("")
-async def list_schedules():
+async def list_schedules(request: Request, response: Response):
+    if (cached := versioning.not_modified(request, response, versioning.schedules)) is not None:
+        return cached
     return sched_service.get_schedules()
 
 
@@ -3,21 +3,26 @@ Monitors active applications on macOS to build a picture of daily work habits.
 Tracks which apps are in the foreground and for how long.
 On non-macOS systems (e.g. the Render Linux host) monitoring is a no-op.
 """
+import os
 import platform
 import time
 import subprocess
 import json
-from datetime import datetime
+from datetime import date, datetime
 from collections import defaultdict
 from threading import Thread, Event
 from pathlib import Path
 
+from app.services import versioning
+
 
 SESSION_LOG_PATH = Path(__file__).parent.parent / "uploads" / "activity_session.json"
+ACTIVITY_ARCHIVE_DIR = Path(__file__).parent.parent / "uploads" / "activity"
 
 _stop_event = Event()
 _session_data: list[dict] = []
 _is_running = False
+_last_rollup: tuple | None = None
 
 
 def get_active_app_macos() -> tuple[str, str]:
@@ -42,12 +47,48 @@ def get_active_app_macos() -> tuple[str, str]:
         return "Unknown", ""
 
 
+def _write_json(path: Path, data: dict):
+    """Write via a temp file and rename, so readers never see a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    """Returns the file's JSON object, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _load_day_timers(day: date) -> dict[str, int]:
+    """Per-app seconds already archived for `day`, so a new session adds to them."""
+    app_timers: dict[str, int] = defaultdict(int)
+    archived = _read_json(ACTIVITY_ARCHIVE_DIR / f"{day.isoformat()}.json") or {}
+    for a in archived.get("top_apps", []):
+        app_timers[a["app"]] += a["seconds"]
+    return app_timers
+
+
 def _monitor_loop(interval_seconds: int = 5):
     global _session_data
-    app_timers: dict[str, int] = defaultdict(int)
+    day = date.today()
+    app_timers = _load_day_timers(day)
     last_app = ""
 
     while not _stop_event.is_set():
+        if date.today() != day:
+            # Midnight rollover: start the new day's totals fresh
+            day = date.today()
+            app_timers = _load_day_timers(day)
+            _session_data = []
+            last_app = ""
+
         app_name, window_title = get_active_app_macos()
 
         if app_name and app_name != "Unknown":
@@ -61,13 +102,14 @@ def _monitor_loop(interval_seconds: int = 5):
                 })
                 last_app = app_name
 
-        _save_session(app_timers)
+        _save_session(app_timers, day)
         time.sleep(interval_seconds)
 
 
-def _save_session(app_timers: dict):
+def _save_session(app_timers: dict, day: date):
+    global _last_rollup
     data = {
-        "date": datetime.now().strftime("%Y-%m-%d"),
+        "date": day.isoformat(),
         "top_apps": sorted(
             [{"app": k, "seconds": v} for k, v in app_timers.items()],
             key=lambda x: x["seconds"],
@@ -76,9 +118,19 @@ def _save_session(app_timers: dict):
         "total_tracked_seconds": sum(app_timers.values()),
         "entries": _session_data[-100:]  # keep last 100 entries in memory
     }
-    SESSION_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(SESSION_LOG_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    _write_json(SESSION_LOG_PATH, data)
+
+    # Per-day rollup (no raw entries) so past days can be reported on later
+    _write_json(
+        ACTIVITY_ARCHIVE_DIR / f"{data['date']}.json",
+        {k: v for k, v in data.items() if k != "entries"},
+    )
+
+    # Only a real change invalidates the activity ETag, not every idle tick
+    rollup = (data["date"], json.dumps(data["top_apps"]), data["total_tracked_seconds"])
+    if rollup != _last_rollup:
+        _last_rollup = rollup
+        versioning.activity.bump()
 
 
 def start_monitoring(interval_seconds: int = 5):
@@ -89,6 +141,7 @@ def start_monitoring(interval_seconds: int = 5):
     _is_running = True
     thread = Thread(target=_monitor_loop, args=(interval_seconds,), daemon=True)
     thread.start()
+    versioning.activity.bump()
     return {"status": "started", "interval_seconds": interval_seconds}
 
 
@@ -96,15 +149,25 @@ def stop_monitoring():
     global _is_running
     _stop_event.set()
     _is_running = False
+    versioning.activity.bump()
     return {"status": "stopped"}
 
 
 def get_session_summary() -> dict:
-    if SESSION_LOG_PATH.exists():
-        with open(SESSION_LOG_PATH, "r") as f:
-            return json.load(f)
+    summary = _read_json(SESSION_LOG_PATH)
+    if summary is not None:
+        return summary
     return {"date": datetime.now().strftime("%Y-%m-%d"), "top_apps": [], "total_tracked_seconds": 0, "entries": []}
 
 
+def get_day_summary(day: date) -> dict | None:
+    """Activity rollup for a given day, or None if nothing was tracked that day."""
+    if day == date.today():
+        summary = _read_json(SESSION_LOG_PATH)
+        if summary and summary.get("date") == day.isoformat():
+            return summary
+    return _read_json(ACTIVITY_ARCHIVE_DIR / f"{day.isoformat()}.json")
+
+
 def is_monitoring() -> bool:
     return _is_running
@@ -1,32 +1,63 @@
 """
 Uses AI (OpenAI or Anthropic) to generate report drafts based on:
-1. Parsed content from uploaded past reports (style/format learning)
+1. Compact style profiles of uploaded past reports (style/format learning)
 2. Current day's activity summary (what was worked on)
 3. User-provided notes or additional context
+
+Daily reports are persisted; weekly and ranged reports are reduced from the
+stored dailies, regenerating only the days that are missing or stale.
 """
 import os
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 import json
 
 from dotenv import load_dotenv
 
+from app.services import activity_monitor, report_history
+from app.services.style_profile import (
+    format_style_profile,
+    load_style_profile,
+    merge_style_profiles,
+)
+
 load_dotenv()
 
 UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
 AI_PROVIDER = os.getenv("AI_PROVIDER", "openai")
+MERGE_TEMPLATE_STYLES = os.getenv("MERGE_TEMPLATE_STYLES", "false").lower() == "true"
+
+# Upper bound on daily-report text sent in one reduce prompt, and how many
+# dailies (or intermediate summaries) are reduced together at each level.
+ROLLUP_CHAR_BUDGET = 12000
+ROLLUP_GROUP_SIZE = 7
+# Most missing/stale dailies one ranged request may regenerate; older days past
+# the cap fall back to their stored report or a plain activity digest.
+MAX_DAILY_REGENERATIONS = 7
 
 
 def _load_report_templates() -> str:
-    """Load all parsed report templates from disk."""
+    """Load the style profiles of all parsed report templates from disk."""
     templates_dir = UPLOAD_DIR / "parsed"
     if not templates_dir.exists():
         return ""
-    templates = []
-    for f in templates_dir.glob("*.txt"):
-        content = f.read_text(encoding="utf-8")
-        templates.append(f"--- Template: {f.stem} ---\n{content[:2000]}")
-    return "\n\n".join(templates)
+    profiles = {f.stem: load_style_profile(f) for f in templates_dir.glob("*.txt")}
+    if not profiles:
+        return ""
+    if MERGE_TEMPLATE_STYLES and len(profiles) > 1:
+        return format_style_profile(
+            "combined", merge_style_profiles(list(profiles.values()))
+        )
+    return "\n\n".join(
+        format_style_profile(name, profile) for name, profile in profiles.items()
+    )
+
+
+def _format_top_apps(activity_summary: dict) -> str:
+    return ", ".join(
+        f"{a['app']} ({a['seconds'] // 60} min)"
+        for a in activity_summary.get("top_apps", [])[:5]
+    ) or "No activity tracked yet"
 
 
 def _build_prompt(
@@ -34,28 +65,26 @@ def _build_prompt(
     activity_summary: dict,
     additional_notes: str,
     tone: str,
-    templates: str
+    templates: str,
+    report_date: date | None = None
 ) -> str:
-    today = datetime.now().strftime("%B %d, %Y")
-    top_apps = ", ".join(
-        f"{a['app']} ({a['seconds'] // 60} min)"
-        for a in activity_summary.get("top_apps", [])[:5]
-    ) or "No activity tracked yet"
+    today = (report_date or datetime.now()).strftime("%B %d, %Y")
+    top_apps = _format_top_apps(activity_summary)
 
     template_section = (
-        f"\n\nHere are examples of past reports to match the style and format:\n{templates}"
+        f"\n\nHere are style profiles of past reports to match the structure and format:\n{templates}"
         if templates else ""
     )
 
     return f"""You are a professional report assistant. Generate a {report_type} report for {today}.
 
 Tone: {tone}
-Main apps used today: {top_apps}
+Main apps used: {top_apps}
 Additional notes from the user: {additional_notes or "None"}
 {template_section}
 
 Instructions:
-- Match the structure and style of the example reports above if provided
+- Match the section order, headings, bullet style, length and phrasing of the style profiles above if provided
 - Highlight key accomplishments and tasks completed
 - Keep it concise and ready to send to a team
 - Use bullet points where appropriate
@@ -87,15 +116,181 @@ def generate_with_anthropic(prompt: str) -> str:
     return message.content[0].text.strip()
 
 
+def _build_rollup_prompt(
+    report_type: str,
+    sections: list[tuple[date, date, str]],
+    additional_notes: str,
+    tone: str,
+    templates: str
+) -> str:
+    start, end = sections[0][0], sections[-1][1]
+    period = f"{start.strftime('%B %d')} – {end.strftime('%B %d, %Y')}"
+    per_section = ROLLUP_CHAR_BUDGET // len(sections)
+    digests = "\n\n".join(
+        f"--- {_period_label(s, e)} ---\n{text[:per_section]}"
+        for s, e, text in sections
+    )
+
+    template_section = (
+        f"\n\nHere are style profiles of past reports to match the structure and format:\n{templates}"
+        if templates else ""
+    )
+
+    return f"""You are a professional report assistant. Generate a {report_type} report covering {period}.
+
+Tone: {tone}
+Additional notes from the user: {additional_notes or "None"}
+
+Here are the reports already written for this period, in order:
+
+{digests}
+{template_section}
+
+Instructions:
+- Combine the reports above into one report for the whole period; do not list them day by day
+- Highlight the most important accomplishments, recurring themes and open items
+- Match the section order, headings, bullet style, length and phrasing of the style profiles above if provided
+- Keep it concise and ready to send to a team
+
+Generate the report now:"""
+
+
+def _period_label(start: date, end: date) -> str:
+    if start == end:
+        return start.strftime("%A, %B %d")
+    return f"{start.strftime('%B %d')} – {end.strftime('%B %d')}"
+
+
+def _complete(prompt: str) -> str:
+    if AI_PROVIDER == "anthropic":
+        return generate_with_anthropic(prompt)
+    return generate_with_openai(prompt)
+
+
+def _generate_daily(
+    day: date, activity_summary: dict, additional_notes: str, tone: str, templates: str
+) -> str:
+    prompt = _build_prompt("daily", activity_summary, additional_notes, tone, templates, day)
+    content = _complete(prompt)
+    report_history.save_daily_report(day, content, activity_summary, tone, additional_notes)
+    return content
+
+
+def _collect_daily_reports(
+    days: list[date], tone: str, templates: str
+) -> list[tuple[date, date, str]]:
+    """
+    Stored daily reports for each day, generating only missing or stale ones
+    (at most MAX_DAILY_REGENERATIONS, most recent days first).
+    """
+    sections = []
+    regenerated = 0
+    for day in reversed(days):
+        activity = activity_monitor.get_day_summary(day)
+        record = report_history.load_daily_report(day)
+        tracked = bool(activity and activity.get("total_tracked_seconds"))
+        if record and report_history.is_current(record, activity):
+            content = record["content"]
+        elif tracked and regenerated < MAX_DAILY_REGENERATIONS:
+            regenerated += 1
+            # Refresh a stale daily with the notes and tone the user gave it
+            notes = record.get("notes", "") if record else ""
+            day_tone = record.get("tone", tone) if record else tone
+            content = _generate_daily(day, activity, notes, day_tone, templates)
+        elif record:
+            content = record["content"]
+        elif tracked:
+            content = f"Main apps used: {_format_top_apps(activity)}"
+        else:
+            continue
+        sections.append((day, day, content))
+    sections.reverse()
+    return sections
+
+
+def _group_sections(
+    sections: list[tuple[date, date, str]]
+) -> list[list[tuple[date, date, str]]]:
+    """
+    Dailies are grouped by calendar week so the cached week summaries are
+    shared by any range covering the same weeks; higher levels go in fixed-size groups.
+    """
+    if all(start == end for start, end, _ in sections):
+        weeks: dict[tuple[int, int], list] = {}
+        for section in sections:
+            weeks.setdefault(section[0].isocalendar()[:2], []).append(section)
+        if len(weeks) < len(sections):
+            return list(weeks.values())
+    return [
+        sections[i:i + ROLLUP_GROUP_SIZE]
+        for i in range(0, len(sections), ROLLUP_GROUP_SIZE)
+    ]
+
+
+def _reduce_group(group: list[tuple[date, date, str]], tone: str) -> str:
+    """Summarise one group, reusing the stored summary if its inputs are unchanged."""
+    if len(group) == 1:
+        return group[0][2]
+    start, end = group[0][0], group[-1][1]
+    key = report_history.rollup_key([text for _, _, text in group], tone)
+    cached = report_history.load_rollup(start, end, key)
+    if cached is not None:
+        return cached
+    content = _complete(_build_rollup_prompt("summary", group, "", tone, ""))
+    report_history.save_rollup(start, end, key, content)
+    return content
+
+
+def generate_ranged_report(
+    report_type: str,
+    additional_notes: str = "",
+    tone: str = "professional",
+    date_range: str | None = None
+) -> str:
+    """
+    Reduce step: builds a weekly/ranged report from stored daily reports.
+    Longer ranges are first reduced week by week (then in groups of
+    ROLLUP_GROUP_SIZE), so each prompt stays within ROLLUP_CHAR_BUDGET however
+    many days are covered; group summaries are cached and only rebuilt when
+    one of their inputs changes.
+    """
+    templates = _load_report_templates()
+    days = report_history.resolve_days(date_range)
+    sections = _collect_daily_reports(days, tone, templates)
+
+    if not sections:
+        prompt = _build_prompt(report_type, {}, additional_notes, tone, templates, days[-1])
+        return _complete(prompt)
+
+    while len(sections) > ROLLUP_GROUP_SIZE:
+        sections = [
+            (group[0][0], group[-1][1], _reduce_group(group, tone))
+            for group in _group_sections(sections)
+        ]
+
+    prompt = _build_rollup_prompt(report_type, sections, additional_notes, tone, templates)
+    return _complete(prompt)
+
+
 def generate_report(
     report_type: str,
     activity_summary: dict,
     additional_notes: str = "",
-    tone: str = "professional"
+    tone: str = "professional",
+    date_range: str | None = None
 ) -> str:
+    if report_type == "daily":
+        templates = _load_report_templates()
+        if date_range:
+            day, _ = report_history.parse_date_range(date_range, single_day=True)
+        else:
+            day = date.today()
+        activity_summary = activity_monitor.get_day_summary(day) or {"date": day.isoformat()}
+        return _generate_daily(day, activity_summary, additional_notes, tone, templates)
+
+    if report_type == "weekly" or date_range:
+        return generate_ranged_report(report_type, additional_notes, tone, date_range)
+
     templates = _load_report_templates()
     prompt = _build_prompt(report_type, activity_summary, additional_notes, tone, templates)
-
-    if AI_PROVIDER == "anthropic":
-        return generate_with_anthropic(prompt)
-    return generate_with_openai(prompt)
+    return _complete(prompt)
@@ -0,0 +1,132 @@
+"""
+Persists generated daily reports together with the activity rollup they were
+built from, so weekly and ranged reports can be reduced from stored dailies
+instead of re-prompting over all raw activity.
+Each day is stored as uploads/daily/YYYY-MM-DD.json; intermediate summaries of
+longer ranges are cached under uploads/daily/rollups/.
+"""
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+DAILY_DIR = Path(__file__).parent.parent / "uploads" / "daily"
+ROLLUP_DIR = DAILY_DIR / "rollups"
+MAX_RANGE_DAYS = 366
+
+
+def compact_rollup(activity_summary: dict) -> dict:
+    """Keep only what a report needs from an activity summary (drop raw entries)."""
+    return {
+        "date": activity_summary.get("date"),
+        "top_apps": activity_summary.get("top_apps", [])[:10],
+        "total_tracked_seconds": activity_summary.get("total_tracked_seconds", 0),
+    }
+
+
+def save_daily_report(
+    day: date, content: str, activity_summary: dict, tone: str, notes: str = ""
+) -> dict:
+    record = {
+        "date": day.isoformat(),
+        "content": content,
+        "tone": tone,
+        "notes": notes,
+        "activity": compact_rollup(activity_summary),
+        "generated_at": datetime.now().isoformat(),
+    }
+    DAILY_DIR.mkdir(parents=True, exist_ok=True)
+    (DAILY_DIR / f"{day.isoformat()}.json").write_text(
+        json.dumps(record, indent=2), encoding="utf-8"
+    )
+    return record
+
+
+def load_daily_report(day: date) -> dict | None:
+    path = DAILY_DIR / f"{day.isoformat()}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def is_current(record: dict, activity_summary: dict | None) -> bool:
+    """A stored daily is reusable unless more activity was tracked since it was made."""
+    if activity_summary is None:
+        return True
+    stored = record.get("activity", {}).get("total_tracked_seconds", 0)
+    return stored == activity_summary.get("total_tracked_seconds", 0)
+
+
+def rollup_key(texts: list[str], tone: str) -> str:
+    """Identifies a group summary by exactly the reports it was reduced from."""
+    digest = hashlib.sha256(tone.encode("utf-8"))
+    for text in texts:
+        digest.update(b"\0" + text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _rollup_path(start: date, end: date) -> Path:
+    return ROLLUP_DIR / f"{start.isoformat()}_{end.isoformat()}.json"
+
+
+def load_rollup(start: date, end: date, key: str) -> str | None:
+    """Cached summary for start..end, if it was built from the same inputs."""
+    path = _rollup_path(start, end)
+    if not path.exists():
+        return None
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+    return record["content"] if record.get("key") == key else None
+
+
+def save_rollup(start: date, end: date, key: str, content: str) -> None:
+    ROLLUP_DIR.mkdir(parents=True, exist_ok=True)
+    record = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "key": key,
+        "content": content,
+        "generated_at": datetime.now().isoformat(),
+    }
+    _rollup_path(start, end).write_text(json.dumps(record, indent=2), encoding="utf-8")
+
+
+def parse_date_range(date_range: str, single_day: bool = False) -> tuple[date, date]:
+    """
+    Parses "YYYY-MM-DD/YYYY-MM-DD", "YYYY-MM-DD..YYYY-MM-DD" or a single
+    "YYYY-MM-DD" into an inclusive (start, end) pair. With `single_day`,
+    ranges spanning more than one day are rejected (daily reports).
+    """
+    for sep in ("/", ".."):
+        if sep in date_range:
+            parts = [p.strip() for p in date_range.split(sep)]
+            break
+    else:
+        parts = [date_range.strip()]
+    if len(parts) > 2:
+        raise ValueError(f"Invalid date range: '{date_range}'. Use YYYY-MM-DD/YYYY-MM-DD.")
+    try:
+        start = date.fromisoformat(parts[0])
+        end = date.fromisoformat(parts[-1])
+    except ValueError:
+        raise ValueError(f"Invalid date range: '{date_range}'. Use YYYY-MM-DD/YYYY-MM-DD.")
+    if end < start:
+        raise ValueError("Date range end is before its start.")
+    if single_day and end != start:
+        raise ValueError("Daily reports cover a single day; use one date, not a range.")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Date range cannot exceed {MAX_RANGE_DAYS} days.")
+    return start, end
+
+
+def resolve_days(date_range: str | None) -> list[date]:
+    """Days covered by a ranged report; defaults to the last 7 days including today."""
+    if date_range:
+        start, end = parse_date_range(date_range)
+    else:
+        end = date.today()
+        start = end - timedelta(days=6)
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
@@ -11,7 +11,7 @@ from pathlib import Path
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.services import ai_generator, activity_monitor
+from app.services import ai_generator, activity_monitor, versioning
 from app.services.email_service import send_report_email
 
 SCHEDULES_FILE = Path(__file__).parent.parent / "schedules.json"
@@ -27,6 +27,7 @@ def _load_schedules() -> list[dict]:
 
 def _save_schedules(schedules: list[dict]) -> None:
     SCHEDULES_FILE.write_text(json.dumps(schedules, indent=2), encoding="utf-8")
+    versioning.schedules.bump()
 
 
 def _run_scheduled_report(
@@ -0,0 +1,201 @@
+"""
+Derives a compact style fingerprint from a parsed report so the AI can match
+its format without being sent the full text: heading hierarchy, section order,
+bullet style, typical length and recurring phrases.
+Profiles are stored as <template>.style.json next to the parsed <template>.txt.
+"""
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+
+PROFILE_SUFFIX = ".style.json"
+
+_MD_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*$")
+_BULLET = re.compile(r"^(\s*)([-*•▪◦]|\d+[.)]|[a-zA-Z][.)])\s+(.*)$")
+_WORD = re.compile(r"[A-Za-z][A-Za-z'’-]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "i", "in", "is", "it", "of", "on", "or", "our", "that", "the", "this", "to",
+    "was", "we", "were", "will", "with",
+}
+
+
+def profile_path(parsed_path: Path) -> Path:
+    return parsed_path.with_name(f"{parsed_path.stem}{PROFILE_SUFFIX}")
+
+
+def _classify_bullet(marker: str) -> str:
+    if marker[0].isdigit():
+        return "numbered"
+    if marker[0].isalpha():
+        return "lettered"
+    return marker
+
+
+def _heading(line: str) -> tuple[int, str] | None:
+    """Returns (level, text) if the line looks like a heading."""
+    md = _MD_HEADING.match(line)
+    if md:
+        return len(md.group(1)), md.group(2).rstrip(":")
+    stripped = line.strip()
+    words = stripped.split()
+    if not words or len(words) > 8 or _BULLET.match(line):
+        return None
+    if stripped.isupper() and any(c.isalpha() for c in stripped):
+        return 1, stripped.rstrip(":")
+    if stripped.endswith(":") and len(stripped) > 1:
+        return 2, stripped.rstrip(":")
+    return None
+
+
+def _recurring_phrases(text: str, limit: int = 8) -> list[str]:
+    words = [w.lower() for w in _WORD.findall(text)]
+    grams: Counter = Counter()
+    for n in (2, 3):
+        for i in range(len(words) - n + 1):
+            gram = words[i:i + n]
+            if all(w in _STOPWORDS for w in gram):
+                continue
+            grams[" ".join(gram)] += 1
+    phrases = []
+    # Most frequent first; on ties the longer phrase wins so its parts are skipped
+    ranked = sorted(grams.items(), key=lambda kv: (-kv[1], -len(kv[0].split())))
+    for phrase, count in ranked:
+        if count < 2 or len(phrases) >= limit:
+            break
+        if any(phrase in p for p in phrases):
+            continue
+        phrases.append(phrase)
+    return phrases
+
+
+def build_style_profile(content: str) -> dict:
+    lines = [l.rstrip() for l in content.splitlines()]
+    non_empty = [l for l in lines if l.strip()]
+
+    headings: list[dict] = []
+    body_lines: list[str] = []
+    bullet_markers: Counter = Counter()
+    bullet_words: list[int] = []
+    nested_bullets = 0
+    for line in non_empty:
+        heading = _heading(line)
+        if heading:
+            level, text = heading
+            headings.append({"level": level, "text": text[:60]})
+            continue
+        body_lines.append(line.strip())
+        bullet = _BULLET.match(line)
+        if bullet:
+            bullet_markers[_classify_bullet(bullet.group(2))] += 1
+            bullet_words.append(len(bullet.group(3).split()))
+            if bullet.group(1):
+                nested_bullets += 1
+
+    paragraphs = [p for p in re.split(r"\n\s*\n", content) if p.strip()]
+    word_count = len(content.split())
+
+    return {
+        "heading_style": (
+            "markdown" if any(_MD_HEADING.match(l) for l in non_empty)
+            else "plain" if headings else "none"
+        ),
+        "heading_levels": sorted({h["level"] for h in headings}),
+        "sections": headings[:12],
+        "bullet_style": bullet_markers.most_common(1)[0][0] if bullet_markers else None,
+        "bullet_count": sum(bullet_markers.values()),
+        "nested_bullets": nested_bullets > 0,
+        "avg_bullet_words": round(sum(bullet_words) / len(bullet_words)) if bullet_words else 0,
+        "word_count": word_count,
+        "paragraph_count": len(paragraphs),
+        "recurring_phrases": _recurring_phrases(content),
+        "opening": body_lines[0][:80] if body_lines else "",
+        "closing": body_lines[-1][:80] if len(body_lines) > 1 else "",
+    }
+
+
+def save_style_profile(parsed_path: Path, profile: dict) -> Path:
+    path = profile_path(parsed_path)
+    path.write_text(json.dumps(profile, indent=2), encoding="utf-8")
+    return path
+
+
+def load_style_profile(parsed_path: Path) -> dict:
+    """Load the stored profile for a parsed template, building it if missing."""
+    path = profile_path(parsed_path)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    profile = build_style_profile(parsed_path.read_text(encoding="utf-8"))
+    save_style_profile(parsed_path, profile)
+    return profile
+
+
+def merge_style_profiles(profiles: list[dict]) -> dict:
+    """Combine several template profiles into one representative profile."""
+    if not profiles:
+        return {}
+    n = len(profiles)
+
+    section_counts: Counter = Counter()
+    first_seen: dict[str, dict] = {}
+    for p in profiles:
+        for s in p["sections"]:
+            key = s["text"].lower()
+            section_counts[key] += 1
+            first_seen.setdefault(key, s)
+    shared = [first_seen[k] for k in first_seen if section_counts[k] > 1 or n == 1]
+
+    phrase_counts: Counter = Counter(
+        phrase for p in profiles for phrase in p["recurring_phrases"]
+    )
+    bullet_styles = Counter(p["bullet_style"] for p in profiles if p["bullet_style"])
+    heading_styles = Counter(p["heading_style"] for p in profiles)
+
+    return {
+        "heading_style": heading_styles.most_common(1)[0][0],
+        "heading_levels": sorted({lvl for p in profiles for lvl in p["heading_levels"]}),
+        "sections": (shared or profiles[0]["sections"])[:12],
+        "bullet_style": bullet_styles.most_common(1)[0][0] if bullet_styles else None,
+        "bullet_count": round(sum(p["bullet_count"] for p in profiles) / n),
+        "nested_bullets": any(p["nested_bullets"] for p in profiles),
+        "avg_bullet_words": round(sum(p["avg_bullet_words"] for p in profiles) / n),
+        "word_count": round(sum(p["word_count"] for p in profiles) / n),
+        "paragraph_count": round(sum(p["paragraph_count"] for p in profiles) / n),
+        "recurring_phrases": [phrase for phrase, _ in phrase_counts.most_common(8)],
+        "opening": profiles[0]["opening"],
+        "closing": profiles[0]["closing"],
+    }
+
+
+def format_style_profile(name: str, profile: dict) -> str:
+    """Render a profile as a few compact prompt lines."""
+    lines = [f"--- Style: {name} ---"]
+    if profile["sections"]:
+        top = min(s["level"] for s in profile["sections"])
+        lines.append("Sections (in order):")
+        lines.extend(
+            f"{'  ' * (s['level'] - top + 1)}{s['text']}" for s in profile["sections"]
+        )
+    if profile["heading_style"] != "none":
+        levels = ", ".join(str(l) for l in profile["heading_levels"])
+        lines.append(f"Headings: {profile['heading_style']} (levels {levels})")
+    if profile["bullet_style"]:
+        nested = ", nested" if profile["nested_bullets"] else ""
+        lines.append(
+            f'Bullets: "{profile["bullet_style"]}"{nested} '
+            f"(~{profile['bullet_count']} per report, ~{profile['avg_bullet_words']} words each)"
+        )
+    lines.append(
+        f"Length: ~{profile['word_count']} words, {profile['paragraph_count']} paragraphs"
+    )
+    if profile["recurring_phrases"]:
+        lines.append(
+            "Recurring phrases: " + ", ".join(f'"{p}"' for p in profile["recurring_phrases"])
+        )
+    if profile["opening"]:
+        lines.append(f'Opening: "{profile["opening"]}"')
+    if profile["closing"]:
+        lines.append(f'Closing: "{profile["closing"]}"')
+    return "\n".join(lines)
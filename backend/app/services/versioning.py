@@ -0,0 +1,58 @@
+"""
+In-memory version counters for the state the dashboard polls: the template
+set, activity monitoring and the schedule store. Each write bumps its counter,
+and routers expose the counter as an ETag so unchanged data can be answered
+with 304 Not Modified without touching disk.
+"""
+import uuid
+from datetime import date
+from threading import Lock
+
+from fastapi import Request, Response
+
+
+# Counters restart at 0 with the process, so tag them with a per-boot id to
+# keep ETags from a previous run from matching.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+class VersionCounter:
+    def __init__(self, name: str, per_day: bool = False):
+        self.name = name
+        # Tag ETags with today's date so day-dependent responses change at midnight
+        self.per_day = per_day
+        self._version = 0
+        self._lock = Lock()
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    @property
+    def etag(self) -> str:
+        day = f"-{date.today().isoformat()}" if self.per_day else ""
+        return f'W/"{self.name}-{_BOOT_ID}-{self._version}{day}"'
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, response: Response, counter: VersionCounter) -> Response | None:
+    """
+    Returns a 304 response if the client's If-None-Match matches the counter's
+    current ETag; otherwise sets ETag/Cache-Control on `response` and returns None.
+    """
+    etag = counter.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {_strip_weak(t.strip()) for t in if_none_match.split(",") if t.strip()}
+    if "*" in client_tags or _strip_weak(etag) in client_tags:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+templates = VersionCounter("templates")
+activity = VersionCounter("activity", per_day=True)
+schedules = VersionCounter("schedules")